@@ -6,7 +6,8 @@ setup(
     packages=find_packages(),
     install_requires=[
         "fastapi>=0.104.0",
-        "uvicorn>=0.24.0",
+        "uvicorn[standard]>=0.24.0",
+        "orjson>=3.9.0",
         "pydantic>=2.4.2",
         "python-dotenv>=1.0.0",
         "langchain>=0.1.0",
@@ -3,15 +3,25 @@ Base class for all financial advisor agents
 """
 
 import logging
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from langchain_openai import ChatOpenAI
 from langchain_core.tools import Tool
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.output_parsers import StrOutputParser
-from langchain.memory import ConversationBufferMemory
+from langchain.memory import ConversationBufferMemory, ConversationBufferWindowMemory
 from langchain.agents import AgentExecutor, create_openai_functions_agent
-from langchain_core.runnables import RunnablePassthrough
+
+# Number of recent exchanges replayed into each prompt by the default memory
+DEFAULT_MEMORY_WINDOW = 10
+
+@lru_cache(maxsize=1)
+def get_default_llm() -> ChatOpenAI:
+    """Return the chat model shared by agents that are not given their own"""
+    return ChatOpenAI(
+        model="gpt-4o-mini",
+        temperature=0.7
+    )
 
 class BaseFinancialAgent:
     """Base class for all financial advisor agents"""
@@ -25,15 +35,13 @@ class BaseFinancialAgent:
     ):
         """Initialize the base agent"""
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.llm = llm or ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.7
-        )
+        self.llm = llm or get_default_llm()
         self.tools = tools or []
         self.system_prompt = system_prompt
-        self.memory = memory or ConversationBufferMemory(
+        self.memory = memory or ConversationBufferWindowMemory(
             memory_key="chat_history",
-            return_messages=True
+            return_messages=True,
+            k=DEFAULT_MEMORY_WINDOW
         )
         
         # Initialize the agent
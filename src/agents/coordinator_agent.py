@@ -2,8 +2,7 @@
 Coordinator Agent for orchestrating the financial advisor system
 """
 
-from typing import Dict, List, Any, Union
-from langchain_core.messages import HumanMessage, AIMessage
+from typing import AsyncIterator, Dict, List, Any, Union
 from langchain_core.tools import Tool
 from langchain_openai import ChatOpenAI
 from langchain.agents import AgentExecutor, create_openai_functions_agent
@@ -18,6 +17,16 @@ from .risk_assessment_agent import RiskAssessmentAgent
 from .portfolio_agent import PortfolioAgent
 from ..services.user_profile_service import UserProfileService
 
+# Fixed market outlook paragraph used in every comprehensive report
+MARKET_OUTLOOK = (
+    "Current market conditions suggest a balanced approach to asset allocation. "
+    "Diversification across multiple asset classes helps manage risk while "
+    "maintaining growth potential."
+)
+
+# Asset types whose display name is an acronym rather than title case
+ASSET_DISPLAY_NAMES = {"etfs": "ETFs", "reits": "REITs"}
+
 class CoordinatorAgent(BaseFinancialAgent):
     """Agent responsible for coordinating between different specialized agents"""
     
@@ -59,9 +68,15 @@ class CoordinatorAgent(BaseFinancialAgent):
         
         Always explain your reasoning and provide clear, actionable advice."""
         
-        # Initialize base class
+        # Initialize base class (builds the agent through _initialize_agent)
         super().__init__(llm=llm, tools=tools, system_prompt=system_prompt)
         
+        # Set up detailed logging
+        self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(logging.DEBUG)
+    
+    def _initialize_agent(self):
+        """Initialize the agent without memory; chat history is passed in on each call"""
         # Create prompt template
         prompt = ChatPromptTemplate.from_messages([
             ("system", self.system_prompt),
@@ -84,10 +99,6 @@ class CoordinatorAgent(BaseFinancialAgent):
             verbose=True,
             handle_parsing_errors=True
         )
-        
-        # Set up detailed logging
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.DEBUG)
     
     def _run_market_analysis(self, query: str) -> str:
         """Run market analysis with proper error handling"""
@@ -156,30 +167,35 @@ class CoordinatorAgent(BaseFinancialAgent):
             self.logger.error(f"Error extracting response content: {str(e)}", exc_info=True)
             return str(response)
     
+    def _build_contextual_message(self, message: str, user_id: str | None = None) -> str:
+        """Prefix the user's question with their saved profile when one exists"""
+        if not (user_id and self.user_profile_service):
+            return message
+        profile = self.user_profile_service.load_profile()
+        if not profile:
+            return message
+        profile_summary = (
+            f"Current user's profile:\n"
+            f"- Name: {profile.name}\n"
+            f"- Age: {profile.age}\n"
+            f"- Income: {profile.income}\n"
+            f"- Risk Tolerance: {profile.risk_tolerance}\n"
+            f"- Investment Goal: {profile.investment_goal}\n"
+            f"- Investment Horizon: {profile.investment_horizon}\n"
+        )
+        return (
+            f"Please answer the user's question based on their profile and the investment report context.\n\n"
+            f"---USER PROFILE---\n{profile_summary}\n\n"
+            f"---USER QUESTION---\n{message}"
+        )
+    
     async def process_message(self, message: str, user_id: str | None = None) -> str:
         """Process a user message and return a response"""
         self.logger.debug(f"Processing message: {message}")
         self.logger.debug(f"User ID: {user_id}")
         
         try:
-            contextual_message = message
-            if user_id and self.user_profile_service:
-                profile = self.user_profile_service.load_profile()
-                if profile:
-                    profile_summary = (
-                        f"Current user's profile:\n"
-                        f"- Name: {profile.name}\n"
-                        f"- Age: {profile.age}\n"
-                        f"- Income: {profile.income}\n"
-                        f"- Risk Tolerance: {profile.risk_tolerance}\n"
-                        f"- Investment Goal: {profile.investment_goal}\n"
-                        f"- Investment Horizon: {profile.investment_horizon}\n"
-                    )
-                    contextual_message = (
-                        f"Please answer the user's question based on their profile and the investment report context.\n\n"
-                        f"---USER PROFILE---\n{profile_summary}\n\n"
-                        f"---USER QUESTION---\n{message}"
-                    )
+            contextual_message = self._build_contextual_message(message, user_id)
 
             # For this MVP, we are not persisting chat history between calls in the chat bubble.
             lc_chat_history = []
@@ -202,6 +218,20 @@ class CoordinatorAgent(BaseFinancialAgent):
             self.logger.error(f"Error processing message: {str(e)}", exc_info=True)
             return f"I apologize, but I encountered an error while processing your request: {str(e)}"
     
+    async def stream_message(self, message: str, user_id: str | None = None) -> AsyncIterator[str]:
+        """Yield response tokens for a user message as the model produces them"""
+        self.logger.debug(f"Streaming message: {message}")
+        contextual_message = self._build_contextual_message(message, user_id)
+        async for event in self.agent_executor.astream_events(
+            {"input": contextual_message, "chat_history": []},
+            version="v2"
+        ):
+            if event["event"] == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                # Tool-selection turns stream function-call arguments, not text
+                if content:
+                    yield content
+    
     async def generate_comprehensive_report(self, user_profile: Dict) -> Dict[str, Any]:
         """Generate a comprehensive investment report with synchronized allocation data"""
         try:
@@ -222,11 +252,7 @@ class CoordinatorAgent(BaseFinancialAgent):
             # Generate the report text with exact percentage matching
             allocation_text_lines = []
             for asset_type, percentage in allocation_dict.items():
-                asset_name = asset_type.replace('_', ' ').title()
-                if asset_type == "etfs":
-                    asset_name = "ETFs"
-                elif asset_type == "reits":
-                    asset_name = "REITs"
+                asset_name = ASSET_DISPLAY_NAMES.get(asset_type) or asset_type.replace('_', ' ').title()
                 allocation_text_lines.append(f"**{asset_name} ({int(percentage * 100)}%)**")
             
             # Create comprehensive report sections
@@ -238,12 +264,6 @@ class CoordinatorAgent(BaseFinancialAgent):
                 f"we recommend a {risk_level} investment approach."
             )
             
-            market_outlook = (
-                "Current market conditions suggest a balanced approach to asset allocation. "
-                "Diversification across multiple asset classes helps manage risk while "
-                "maintaining growth potential."
-            )
-            
             recommendations = (
                 f"Your recommended portfolio allocation: {', '.join(allocation_text_lines)}. "
                 f"This allocation balances risk and return potential based on your {risk_level} "
@@ -254,7 +274,7 @@ class CoordinatorAgent(BaseFinancialAgent):
 {profile_summary}
 
 Market Outlook:
-{market_outlook}
+{MARKET_OUTLOOK}
 
 Recommendations:
 {recommendations}"""
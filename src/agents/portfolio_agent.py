@@ -6,11 +6,43 @@ from typing import Dict, List, Optional
 from langchain_core.tools import Tool
 from pydantic import BaseModel, Field
 from langchain_openai import ChatOpenAI
-import numpy as np
-from datetime import datetime, timedelta
 
 from .base_agent import BaseFinancialAgent
 
+# Target allocations for each risk level
+_TARGET_ALLOCATIONS = {
+    "conservative": {
+        "stocks": 0.25,
+        "bonds": 0.45,
+        "cash": 0.15,
+        "real_estate": 0.05,
+        "commodities": 0.05,
+        "cryptocurrency": 0.00,
+        "etfs": 0.03,
+        "reits": 0.02
+    },
+    "moderate": {
+        "stocks": 0.50,
+        "bonds": 0.25,
+        "cash": 0.10,
+        "real_estate": 0.05,
+        "commodities": 0.05,
+        "cryptocurrency": 0.02,
+        "etfs": 0.02,
+        "reits": 0.01
+    },
+    "aggressive": {
+        "stocks": 0.65,
+        "bonds": 0.15,
+        "cash": 0.05,
+        "real_estate": 0.05,
+        "commodities": 0.05,
+        "cryptocurrency": 0.03,
+        "etfs": 0.01,
+        "reits": 0.01
+    }
+}
+
 class PortfolioAllocation(BaseModel):
     """Structured output for portfolio allocation"""
     stocks: float = Field(description="Percentage allocation to stocks")
@@ -95,42 +127,8 @@ class PortfolioAgent(BaseFinancialAgent):
                 else:
                     risk_level = profile.get("risk_level", "moderate").lower()
             
-            # Define target allocations based on risk level
-            allocations = {
-                "conservative": {
-                    "stocks": 0.25,
-                    "bonds": 0.45,
-                    "cash": 0.15,
-                    "real_estate": 0.05,
-                    "commodities": 0.05,
-                    "cryptocurrency": 0.00,
-                    "etfs": 0.03,
-                    "reits": 0.02
-                },
-                "moderate": {
-                    "stocks": 0.50,
-                    "bonds": 0.25,
-                    "cash": 0.10,
-                    "real_estate": 0.05,
-                    "commodities": 0.05,
-                    "cryptocurrency": 0.02,
-                    "etfs": 0.02,
-                    "reits": 0.01
-                },
-                "aggressive": {
-                    "stocks": 0.65,
-                    "bonds": 0.15,
-                    "cash": 0.05,
-                    "real_estate": 0.05,
-                    "commodities": 0.05,
-                    "cryptocurrency": 0.03,
-                    "etfs": 0.01,
-                    "reits": 0.01
-                }
-            }
-            
             # Get allocation for risk level
-            target_allocation = allocations.get(risk_level, allocations["moderate"])
+            target_allocation = _TARGET_ALLOCATIONS.get(risk_level, _TARGET_ALLOCATIONS["moderate"])
             
             return PortfolioAllocation(**target_allocation)
             
@@ -2,11 +2,35 @@
 Risk Assessment Agent for evaluating investment risk profiles
 """
 
+import re
 from typing import Dict, List, Optional
 from langchain_core.tools import Tool
 from pydantic import BaseModel, Field
 from .base_agent import BaseFinancialAgent
 
+# Patterns for pulling profile details out of free-form text
+_AGE_RE = re.compile(r"(\d+)\s*year old", re.IGNORECASE)
+# Amounts with decimals or a k/m suffix ("$85.5k", "$1.5M") are not matched,
+# so they fall back to the default income instead of being truncated
+_INCOME_RE = re.compile(r"\$\s*(\d[\d,]*)(?![\d.]|,\d|\s*[kKmM]\b)")
+
+# Recommendations for each risk band
+_HIGH_RISK_RECOMMENDATIONS = (
+    "Consider a growth-oriented portfolio",
+    "Focus on equities with some alternative investments",
+    "Regular portfolio rebalancing recommended"
+)
+_MODERATE_RISK_RECOMMENDATIONS = (
+    "Balanced portfolio of stocks and bonds",
+    "Consider index funds for core holdings",
+    "Quarterly portfolio review recommended"
+)
+_LOW_RISK_RECOMMENDATIONS = (
+    "Conservative portfolio with focus on stability",
+    "Higher allocation to bonds and cash equivalents",
+    "Annual portfolio review sufficient"
+)
+
 class RiskProfile(BaseModel):
     """Structured input for risk assessment"""
     age: int = Field(description="Age of the investor")
@@ -127,20 +151,14 @@ class RiskAssessmentAgent(BaseFinancialAgent):
             
             # Try to extract from string as backup
             # Extract age
-            if "year old" in profile.lower():
-                try:
-                    age = int(profile.split("year old")[0].strip().split()[-1])
-                    profile_data["age"] = age
-                except:
-                    pass
+            age_match = _AGE_RE.search(profile)
+            if age_match:
+                profile_data["age"] = int(age_match.group(1))
             
             # Extract income
-            if "$" in profile:
-                try:
-                    income = int(profile.split("$")[1].split()[0].replace(",", ""))
-                    profile_data["income"] = income
-                except:
-                    pass
+            income_match = _INCOME_RE.search(profile)
+            if income_match:
+                profile_data["income"] = int(income_match.group(1).replace(",", ""))
             
             # Extract risk tolerance
             risk_levels = ["conservative", "moderate", "aggressive"]
@@ -184,28 +202,11 @@ class RiskAssessmentAgent(BaseFinancialAgent):
     
     async def _generate_recommendations(self, risk_score: float, profile: RiskProfile) -> List[str]:
         """Generate investment recommendations based on risk assessment"""
-        recommendations = []
-        
         if risk_score >= 0.7:
-            recommendations.extend([
-                "Consider a growth-oriented portfolio",
-                "Focus on equities with some alternative investments",
-                "Regular portfolio rebalancing recommended"
-            ])
+            return list(_HIGH_RISK_RECOMMENDATIONS)
         elif risk_score >= 0.4:
-            recommendations.extend([
-                "Balanced portfolio of stocks and bonds",
-                "Consider index funds for core holdings",
-                "Quarterly portfolio review recommended"
-            ])
-        else:
-            recommendations.extend([
-                "Conservative portfolio with focus on stability",
-                "Higher allocation to bonds and cash equivalents",
-                "Annual portfolio review sufficient"
-            ])
-        
-        return recommendations
+            return list(_MODERATE_RISK_RECOMMENDATIONS)
+        return list(_LOW_RISK_RECOMMENDATIONS)
     
     async def process_message(self, message: str, chat_history: List[Dict[str, str]] = None) -> str:
         """Process a message and return a response"""
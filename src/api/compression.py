@@ -0,0 +1,22 @@
+"""
+GZip middleware that leaves streaming endpoints uncompressed
+"""
+
+from typing import Iterable
+
+from starlette.middleware.gzip import GZipMiddleware
+
+class SelectiveGZipMiddleware:
+    """Compress responses except for the given paths, e.g. server-sent event streams"""
+
+    def __init__(self, app, exclude_paths: Iterable[str] = (), **gzip_options):
+        self.app = app
+        self.gzip = GZipMiddleware(app, **gzip_options)
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            # Older GZipMiddleware releases buffer event streams, delaying tokens
+            await self.app(scope, receive, send)
+            return
+        await self.gzip(scope, receive, send)
@@ -2,20 +2,27 @@
 FastAPI application for Financial Investment Advisor Agent System
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Dict, List, Optional, Any
-import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
+import asyncio
+import hashlib
 import logging
 import uuid
 from fastapi import Path
 import re
-from fastapi.responses import JSONResponse
+import textwrap
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+import orjson
 
 from src.agents import CoordinatorAgent
-from langchain_openai import ChatOpenAI
+from src.config.settings import settings
+from src.utils.ttl_cache import TTLCache
+from src.api.compression import SelectiveGZipMiddleware
+from src.api.health_interceptor import HEALTHY_BODY, HealthCheckInterceptor
 from src.services.user_profile_service import UserProfileService
 from src.models.user_profile import UserProfile, InvestmentPreference
 from src.models.fap_context import FAPContext
@@ -27,7 +34,7 @@ from src.services.journal_service import JournalService
 from src.services.market_data_service import MarketDataService
 from src.services.market_analysis_service import MarketAnalysisService
 from src.services.fap_results_service import FAPResultsService
-from src.services.profile_portfolio_service import ProfilePortfolioService
+from src.services.profile_portfolio_service import DEFAULT_ALLOCATIONS, ProfilePortfolioService
 
 # Load environment variables
 load_dotenv()
@@ -36,22 +43,167 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sections of the coordinator's profile-update proposal
+ALLOCATION_SECTION_RE = re.compile(r"Portfolio Allocation:\n([\s\S]*?)---")
+REPORT_SECTION_RE = re.compile(r"Report:\n([\s\S]*?)---")
+ALLOCATION_LINE_RE = re.compile(r"^-?[ \t]*([A-Za-z ]+):[ \t]*(\d+(?:\.\d+)?)%", re.MULTILINE)
+
+def parse_allocation_proposal(text: str) -> Tuple[List[Dict[str, Any]], str]:
+    """Split a profile-update proposal into its allocation list and report text"""
+    alloc_match = ALLOCATION_SECTION_RE.search(text)
+    report_match = REPORT_SECTION_RE.search(text)
+    # One pass over the section; the pattern is anchored to line starts
+    allocation = [
+        {
+            "asset_type": m.group(1).strip().lower(),
+            "allocation_percentage": float(m.group(2))
+        }
+        for m in ALLOCATION_LINE_RE.finditer(alloc_match.group(1))
+    ] if alloc_match else []
+    # If report section is missing, use the whole output as the report
+    if report_match:
+        report = report_match.group(1).strip()
+    else:
+        report = text.strip()
+    return allocation, report
+
+# Prompt for the coordinator when a profile is updated
+PROFILE_PROPOSAL_PROMPT = (
+    "User profile updated: Name: {name}, Age: {age}, Income: {income}, Risk Tolerance: {risk_tolerance}, Investment Goal: {investment_goal}, Investment Horizon: {investment_horizon}. "
+    "Please propose a personalized investment option with recommended portfolio allocation only as a list (e.g., Stocks: 50%, Bonds: 20%, Cash: 5%, Real Estate: 10%, Commodities: 5%, Cryptocurrency: 3%, ETFs: 5%, REITs: 2%). "
+    "Include all asset classes, even if the allocation is 0%. "
+    "In your report, clearly label sections as 'Summary', 'Market Outlook', and 'Recommendations', and ensure the allocation in the report matches the recommended allocation list. "
+    "Format your output as:\n---\nPortfolio Allocation:\n<list>\n---\nReport:\nSummary:\n<summary>\nMarket Outlook:\n<outlook>\nRecommendations:\n<recommendations>\n---"
+)
+
+# Prompts for the fap_analyze shortcuts, filled with str.format_map
+MARKET_PERIOD_PROMPT = textwrap.dedent("""\
+    You are a professional financial advisor. Provide a comprehensive market analysis for {name} ({symbol}) with clear, actionable recommendations.
+
+    CURRENT MARKET DATA:
+    - Current Price: ${current_price}
+    - Daily Change: ${daily_change} ({daily_change_percent}%)
+
+    PERIOD ANALYSIS ({period} timeframe):
+    - Start Price: ${start_price:.2f}
+    - End Price: ${end_price:.2f}
+    - Total Change: ${period_change:.2f} ({period_change_percent:.2f}%)
+    - Period High: ${high_price:.2f}
+    - Period Low: ${low_price:.2f}
+    - Volatility: {volatility:.1f}% (annualized)
+
+    USER PROFILE:
+    - Risk Tolerance: {risk_tolerance}
+    - Investment Goal: {investment_goal}
+    - Investment Horizon: {investment_horizon}
+
+    Please structure your response with these exact sections:
+
+    📈 MARKET TREND ANALYSIS ({period} Performance):
+    [Analyze the {period_change:.2f} change over {period} period, trend direction, momentum]
+
+    📊 TECHNICAL ANALYSIS:
+    [Support/resistance levels based on period high ${high_price:.2f} and low ${low_price:.2f}, key price levels]
+
+    ⚠️ RISK ASSESSMENT:
+    [Volatility analysis based on {volatility:.1f}% volatility, risk factors, correlation with market]
+
+    💰 FINANCIAL ADVISOR RECOMMENDATIONS:
+    [Specific actionable advice based on {risk_tolerance} risk tolerance and {investment_goal} goal]
+
+    🎯 PORTFOLIO ALLOCATION GUIDANCE:
+    [Suggested allocation percentage for this asset in a {risk_tolerance} risk portfolio]
+
+    ⏰ TIMING & ENTRY STRATEGY:
+    [Best entry points, dollar-cost averaging suggestions, timing considerations]
+
+    🚨 KEY LEVELS TO WATCH:
+    [Critical support/resistance levels, stop-loss suggestions, profit-taking levels]
+
+    Keep each section concise but actionable. Focus on practical investment decisions.
+""")
+
+MARKET_BASIC_PROMPT = textwrap.dedent("""\
+    You are a professional financial advisor. Provide a market analysis for {name} ({symbol}).
+
+    CURRENT MARKET DATA:
+    - Current Price: ${current_price}
+    - Daily Change: {daily_change} ({daily_change_percent}%)
+    - Selected Period: {period}
+
+    USER PROFILE:
+    - Risk Tolerance: {risk_tolerance}
+    - Investment Goal: {investment_goal}
+    - Investment Horizon: {investment_horizon}
+
+    Please provide structured analysis with clear recommendations based on the user's {risk_tolerance} risk tolerance and {investment_goal} investment goal.
+""")
+
+JOURNAL_INSIGHTS_PROMPT = textwrap.dedent("""\
+    Analyze this investment journal entry and provide insights:
+
+    Journal Entry: "{journal_entry}"
+    {symbol_line}
+
+    User Profile:
+    - Risk Tolerance: {risk_tolerance}
+    - Investment Goal: {investment_goal}
+    - Investment Horizon: {investment_horizon}
+
+    Please provide:
+    1. Analysis of the investment thoughts/decisions mentioned
+    2. Potential risks or opportunities identified
+    3. Recommendations based on the user's risk profile
+    4. Educational insights related to the content
+
+    Keep the response concise but insightful.
+""")
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+def etag_json_response(request: Request, content: Any) -> Response:
+    """Return content as JSON with an ETag, or an empty 304 if the client already has it"""
+    body = ORJSONResponse(content=jsonable_encoder(content)).body
+    # Weak, because GZip may re-encode the body after the tag is computed
+    opaque_tag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    etag = f"W/{opaque_tag}"
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        client_tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if opaque_tag in client_tags or "*" in client_tags:
+            return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Financial Investment Advisor API",
     description="API for the Financial Investment Advisor Agent System",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Answer health probes ahead of routing; added first so that it sits inside
+# the CORS middleware and cross-origin probes still get CORS headers
+app.add_middleware(HealthCheckInterceptor, paths=["/api/v1/health"])
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
+    allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=settings.CORS_METHODS,
+    allow_headers=settings.CORS_HEADERS,
+    max_age=settings.CORS_MAX_AGE,
 )
 
+# Compress larger JSON payloads such as FAP results and saved analyses; the
+# chat event stream is left alone so tokens are not held back
+app.add_middleware(SelectiveGZipMiddleware, exclude_paths=["/api/v1/chat/stream"], minimum_size=1024)
+
 # Initialize services and agents
 user_profile_service = UserProfileService()
 portfolio_service = PortfolioService()
@@ -62,6 +214,46 @@ fap_results_service = FAPResultsService()
 profile_portfolio_service = ProfilePortfolioService()
 coordinator = CoordinatorAgent(user_profile_service=user_profile_service)
 
+# Pre-serialized default allocation responses; the tables only change on deploy
+ALLOCATION_RESPONSE_BODIES = {
+    risk_tolerance: orjson.dumps({
+        "success": True,
+        "allocation": allocation,
+        "risk_tolerance": risk_tolerance
+    })
+    for risk_tolerance, allocation in DEFAULT_ALLOCATIONS.items()
+}
+ALLOCATION_CACHE_HEADERS = {"Cache-Control": "public, max-age=86400"}
+
+# Profile-update proposals by profile hash; the LLM call dominates the request
+proposal_cache = TTLCache(ttl=3600)
+
+def profile_cache_key(profile_fields: Dict[str, Any]) -> str:
+    """Stable hash of the profile fields that feed an analysis prompt"""
+    payload = orjson.dumps(profile_fields, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def with_session_id(fap_context: Dict[str, Any], session_id: str) -> Dict[str, Any]:
+    """Copy a dumped FAP context with session_id set on it and on every history snapshot"""
+    return {
+        **fap_context,
+        "session_id": session_id,
+        "history": [with_session_id(snapshot, session_id) for snapshot in fap_context.get("history", [])],
+    }
+
+# Agent runs currently in progress, so identical concurrent requests share one
+_inflight: Dict[str, asyncio.Task] = {}
+
+async def single_flight(key: str, run: Callable[[], Awaitable[Any]]) -> Any:
+    """Await the in-progress run for key, starting one if there is none"""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(run())
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _inflight.pop(key, None) if _inflight.get(key) is done else None)
+    # A cancelled caller must not cancel the run the others are waiting on
+    return await asyncio.shield(task)
+
 # Define request/response models
 class ChatRequest(BaseModel):
     message: str
@@ -109,6 +301,22 @@ class FAPAnalyzeResponse(BaseModel):
     used_fallback: bool = False
     fallback_response: Optional[str] = None
 
+class MarketAnalysisSaveRequest(BaseModel):
+    """Request model for saving a market analysis"""
+    symbol: str
+    period: str
+    analysis_data: Dict[str, Any]
+
+class FAPSessionStatusRequest(BaseModel):
+    """Request model for updating the FAP session status"""
+    active: bool = True
+
+class ProfilePortfolioRequest(BaseModel):
+    """Request model for saving or updating the profile portfolio"""
+    user_profile: Dict[str, Any]
+    portfolio_allocation: List[Dict[str, Any]]
+    portfolio_summary: str
+
 # Define routes
 @app.post("/api/v1/chat", response_model=ChatResponse)
 async def process_chat(request: ChatRequest):
@@ -120,12 +328,27 @@ async def process_chat(request: ChatRequest):
         logger.error(f"Error processing chat message: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/v1/chat/stream")
+async def stream_chat(request: ChatRequest):
+    """Stream chat responses to the client as server-sent events"""
+    async def event_stream():
+        try:
+            async for token in coordinator.stream_message(request.message, request.user_id):
+                yield b"data: " + orjson.dumps({"token": token}) + b"\n\n"
+        except Exception as e:
+            logger.error(f"Error streaming chat message: {str(e)}")
+            yield b"event: error\ndata: " + orjson.dumps({"error": str(e)}) + b"\n\n"
+        yield b"event: done\ndata: {}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 @app.post("/api/v1/profile", response_model=UserProfileResponse)
 async def create_profile(request: UserProfileRequest):
     """Create a new user profile"""
     try:
-        user_id = str(uuid.uuid4())
-        profile = user_profile_service.create_default_profile(
+        user_id = uuid.uuid4().hex
+        profile = await asyncio.to_thread(
+            user_profile_service.create_default_profile,
             user_id=user_id,
             name=request.name,
             age=request.age,
@@ -137,7 +360,7 @@ async def create_profile(request: UserProfileRequest):
         profile.investment_goal = request.investment_goal
         profile.investment_horizon = request.investment_horizon
         
-        if not user_profile_service.save_profile(profile):
+        if not await asyncio.to_thread(user_profile_service.save_profile, profile):
             raise HTTPException(status_code=500, detail="Failed to save profile")
         
         return UserProfileResponse(
@@ -146,14 +369,14 @@ async def create_profile(request: UserProfileRequest):
             risk_tolerance=profile.risk_tolerance,
             investment_goal=profile.investment_goal,
             investment_horizon=profile.investment_horizon,
-            preferences=[p.model_dump() for p in profile.preferences]
+            preferences=[preference.model_dump() for preference in profile.preferences]
         )
     except Exception as e:
         logger.error(f"Error creating user profile: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v1/portfolio/summary")
-async def get_portfolio_summary():
+def get_portfolio_summary():
     """Get user's portfolio summary or signal no profile exists"""
     try:
         summary = user_profile_service.get_portfolio_summary()
@@ -169,14 +392,14 @@ async def get_portfolio_summary():
 @app.get("/api/v1/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
+    return Response(content=HEALTHY_BODY, media_type="application/json")
 
 @app.put("/api/v1/profile/{user_id}", response_model=InvestmentProposalResponse)
 async def update_profile(user_id: str = Path(...), request: UserProfileRequest = None):
     """Update an existing user profile and return investment proposal"""
     try:
         # Load and update the profile
-        profile = user_profile_service.load_profile()
+        profile = await asyncio.to_thread(user_profile_service.load_profile)
         if not profile:
             raise HTTPException(status_code=404, detail="Profile not found")
         profile.name = request.name
@@ -185,31 +408,31 @@ async def update_profile(user_id: str = Path(...), request: UserProfileRequest =
         profile.risk_tolerance = request.risk_tolerance
         profile.investment_goal = request.investment_goal
         profile.investment_horizon = request.investment_horizon
-        # Use multi-agent system to generate new allocation
-        portfolio_response = await coordinator.process_message(
-            f"User profile updated: Name: {profile.name}, Age: {profile.age}, Income: {profile.income}, Risk Tolerance: {profile.risk_tolerance}, Investment Goal: {profile.investment_goal}, Investment Horizon: {profile.investment_horizon}. Please propose a personalized investment option with recommended portfolio allocation only as a list (e.g., Stocks: 50%, Bonds: 20%, Cash: 5%, Real Estate: 10%, Commodities: 5%, Cryptocurrency: 3%, ETFs: 5%, REITs: 2%). Include all asset classes, even if the allocation is 0%. In your report, clearly label sections as 'Summary', 'Market Outlook', and 'Recommendations', and ensure the allocation in the report matches the recommended allocation list. Format your output as:\n---\nPortfolio Allocation:\n<list>\n---\nReport:\nSummary:\n<summary>\nMarket Outlook:\n<outlook>\nRecommendations:\n<recommendations>\n---",
-            profile.user_id
-        )
+        # Use multi-agent system to generate new allocation, unless this
+        # profile was proposed for recently
+        prompt_fields = {
+            "name": profile.name,
+            "age": profile.age,
+            "income": profile.income,
+            "risk_tolerance": profile.risk_tolerance,
+            "investment_goal": profile.investment_goal,
+            "investment_horizon": profile.investment_horizon,
+        }
+        cache_key = profile_cache_key({"user_id": profile.user_id, **prompt_fields})
+        portfolio_response = proposal_cache.get(cache_key)
+        if portfolio_response is None:
+            portfolio_response = await coordinator.process_message(
+                PROFILE_PROPOSAL_PROMPT.format_map(prompt_fields),
+                profile.user_id
+            )
         # Parse allocation and report
-        alloc_match = re.search(r"Portfolio Allocation:\n([\s\S]*?)---", portfolio_response)
-        report_match = re.search(r"Report:\n([\s\S]*?)---", portfolio_response)
-        allocation_lines = alloc_match.group(1).strip().split("\n") if alloc_match else []
-        allocation = []
-        for line in allocation_lines:
-            m = re.match(r"-?\s*([A-Za-z ]+):\s*(\d+(?:\.\d+)?)%", line)
-            if m:
-                allocation.append({
-                    "asset_type": m.group(1).strip().lower(),
-                    "allocation_percentage": float(m.group(2))
-                })
-        # If report section is missing, use the whole output as the report
-        if report_match:
-            report = report_match.group(1).strip()
-        else:
-            report = portfolio_response.strip()
+        allocation, report = parse_allocation_proposal(portfolio_response)
+        # Only reuse proposals that carried an allocation; errors are retried
+        if allocation:
+            proposal_cache.set(cache_key, portfolio_response)
         # Save the latest report to the profile and persist
         profile.last_report = report
-        user_profile_service.save_profile(profile)
+        await asyncio.to_thread(user_profile_service.save_profile, profile)
         return InvestmentProposalResponse(user_id=profile.user_id, proposal=portfolio_response)
     except Exception as e:
         logger.error(f"Error updating user profile: {str(e)}")
@@ -219,12 +442,10 @@ async def update_profile(user_id: str = Path(...), request: UserProfileRequest =
 async def get_portfolio_analysis():
     """Return dynamically generated allocation and report based on current user profile."""
     try:
-        profile = user_profile_service.load_profile()
+        profile = await asyncio.to_thread(user_profile_service.load_profile)
         if not profile:
-            return JSONResponse(status_code=404, content={"error": "No user profile found"})
+            return ORJSONResponse(status_code=404, content={"error": "No user profile found"})
         
-        # Generate dynamic allocation and report using the coordinator agent
-        coordinator = CoordinatorAgent(user_profile_service=user_profile_service)
         user_profile_dict = {
             "age": profile.age,
             "risk_tolerance": profile.risk_tolerance,
@@ -234,15 +455,20 @@ async def get_portfolio_analysis():
             "income": profile.income
         }
         
-        # Generate comprehensive report with synchronized data
+        # Generate comprehensive report with synchronized data using the shared coordinator
         report_data = await coordinator.generate_comprehensive_report(user_profile_dict)
         
-        # Update profile preferences to match the new allocation
-        if report_data["allocation"]:
+        # Update profile preferences to match the new allocation, unless the
+        # saved profile already matches it
+        already_saved = profile.last_report == report_data["report"] and [
+            (p.asset_type, p.allocation_percentage) for p in profile.preferences
+        ] == [
+            (a["asset_type"], a["allocation_percentage"]) for a in report_data["allocation"]
+        ]
+        if report_data["allocation"] and not already_saved:
             # Clear existing preferences and add new ones
             profile.preferences = []
             for alloc in report_data["allocation"]:
-                from ..models.user_profile import InvestmentPreference
                 preference = InvestmentPreference(
                     asset_type=alloc["asset_type"],
                     allocation_percentage=alloc["allocation_percentage"],
@@ -253,7 +479,7 @@ async def get_portfolio_analysis():
             
             # Save updated profile with new report
             profile.last_report = report_data["report"]
-            user_profile_service.save_profile(profile)
+            await asyncio.to_thread(user_profile_service.save_profile, profile)
         
         return {
             "allocation": report_data["allocation"],
@@ -262,7 +488,7 @@ async def get_portfolio_analysis():
         
     except Exception as e:
         logger.error(f"Error loading portfolio analysis: {str(e)}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 @app.post("/api/v1/fap/analyze", response_model=FAPAnalyzeResponse)
 async def fap_analyze(request: FAPAnalyzeRequest):
@@ -281,75 +507,28 @@ async def fap_analyze(request: FAPAnalyzeRequest):
         
         if analysis_type == "market_analysis":
             # Handle market analysis specifically
-            coordinator = CoordinatorAgent()
             market_data = request.additional_context.get("market_data", {})
             period_analysis = market_data.get("period_analysis")
             
+            prompt_fields = {
+                "name": market_data.get('name', 'the selected index'),
+                "symbol": market_data.get('symbol', 'N/A'),
+                "current_price": market_data.get('current_price', 'N/A'),
+                "daily_change": market_data.get('daily_change', 'N/A'),
+                "daily_change_percent": market_data.get('daily_change_percent', 'N/A'),
+                "period": market_data.get('period', '1d'),
+                "risk_tolerance": request.risk_tolerance,
+                "investment_goal": request.investment_goal,
+                "investment_horizon": request.investment_horizon,
+            }
+            
             # Create a focused market analysis prompt with period-specific data
             if period_analysis:
                 # Use period-based analysis when available
-                prompt = f"""
-                You are a professional financial advisor. Provide a comprehensive market analysis for {market_data.get('name', 'the selected index')} ({market_data.get('symbol', 'N/A')}) with clear, actionable recommendations.
-                
-                CURRENT MARKET DATA:
-                - Current Price: ${market_data.get('current_price', 'N/A')}
-                - Daily Change: ${market_data.get('daily_change', 'N/A')} ({market_data.get('daily_change_percent', 'N/A')}%)
-                
-                PERIOD ANALYSIS ({period_analysis['period']} timeframe):
-                - Start Price: ${period_analysis['start_price']:.2f}
-                - End Price: ${period_analysis['end_price']:.2f}
-                - Total Change: ${period_analysis['period_change']:.2f} ({period_analysis['period_change_percent']:.2f}%)
-                - Period High: ${period_analysis['high_price']:.2f}
-                - Period Low: ${period_analysis['low_price']:.2f}
-                - Volatility: {period_analysis['volatility']:.1f}% (annualized)
-                
-                USER PROFILE:
-                - Risk Tolerance: {request.risk_tolerance}
-                - Investment Goal: {request.investment_goal}
-                - Investment Horizon: {request.investment_horizon}
-                
-                Please structure your response with these exact sections:
-                
-                📈 MARKET TREND ANALYSIS ({period_analysis['period']} Performance):
-                [Analyze the {period_analysis['period_change']:.2f} change over {period_analysis['period']} period, trend direction, momentum]
-                
-                📊 TECHNICAL ANALYSIS:
-                [Support/resistance levels based on period high ${period_analysis['high_price']:.2f} and low ${period_analysis['low_price']:.2f}, key price levels]
-                
-                ⚠️ RISK ASSESSMENT:
-                [Volatility analysis based on {period_analysis['volatility']:.1f}% volatility, risk factors, correlation with market]
-                
-                💰 FINANCIAL ADVISOR RECOMMENDATIONS:
-                [Specific actionable advice based on {request.risk_tolerance} risk tolerance and {request.investment_goal} goal]
-                
-                🎯 PORTFOLIO ALLOCATION GUIDANCE:
-                [Suggested allocation percentage for this asset in a {request.risk_tolerance} risk portfolio]
-                
-                ⏰ TIMING & ENTRY STRATEGY:
-                [Best entry points, dollar-cost averaging suggestions, timing considerations]
-                
-                🚨 KEY LEVELS TO WATCH:
-                [Critical support/resistance levels, stop-loss suggestions, profit-taking levels]
-                
-                Keep each section concise but actionable. Focus on practical investment decisions.
-                """
+                prompt = MARKET_PERIOD_PROMPT.format_map({**prompt_fields, **period_analysis})
             else:
                 # Fallback to basic analysis when period data is not available
-                prompt = f"""
-                You are a professional financial advisor. Provide a market analysis for {market_data.get('name', 'the selected index')} ({market_data.get('symbol', 'N/A')}).
-                
-                CURRENT MARKET DATA:
-                - Current Price: ${market_data.get('current_price', 'N/A')}
-                - Daily Change: {market_data.get('daily_change', 'N/A')} ({market_data.get('daily_change_percent', 'N/A')}%)
-                - Selected Period: {market_data.get('period', '1d')}
-                
-                USER PROFILE:
-                - Risk Tolerance: {request.risk_tolerance}
-                - Investment Goal: {request.investment_goal}
-                - Investment Horizon: {request.investment_horizon}
-                
-                Please provide structured analysis with clear recommendations based on the user's {request.risk_tolerance} risk tolerance and {request.investment_goal} investment goal.
-                """
+                prompt = MARKET_BASIC_PROMPT.format_map(prompt_fields)
             
             response = await coordinator.process_message(prompt)
             return FAPAnalyzeResponse(
@@ -360,29 +539,16 @@ async def fap_analyze(request: FAPAnalyzeRequest):
         
         elif analysis_type == "journal_insights":
             # Handle journal insights
-            coordinator = CoordinatorAgent()
             journal_entry = request.additional_context.get("journal_entry", "")
             symbol = request.additional_context.get("symbol", "")
             
-            prompt = f"""
-            Analyze this investment journal entry and provide insights:
-            
-            Journal Entry: "{journal_entry}"
-            {f"Related Symbol: {symbol}" if symbol else ""}
-            
-            User Profile:
-            - Risk Tolerance: {request.risk_tolerance}
-            - Investment Goal: {request.investment_goal}
-            - Investment Horizon: {request.investment_horizon}
-            
-            Please provide:
-            1. Analysis of the investment thoughts/decisions mentioned
-            2. Potential risks or opportunities identified
-            3. Recommendations based on the user's risk profile
-            4. Educational insights related to the content
-            
-            Keep the response concise but insightful.
-            """
+            prompt = JOURNAL_INSIGHTS_PROMPT.format_map({
+                "journal_entry": journal_entry,
+                "symbol_line": f"Related Symbol: {symbol}" if symbol else "",
+                "risk_tolerance": request.risk_tolerance,
+                "investment_goal": request.investment_goal,
+                "investment_horizon": request.investment_horizon,
+            })
             
             response = await coordinator.process_message(prompt)
             return FAPAnalyzeResponse(
@@ -393,49 +559,45 @@ async def fap_analyze(request: FAPAnalyzeRequest):
     
     if request.fallback:
         # Use the old agent pipeline as fallback
-        coordinator = CoordinatorAgent()
         profile_str = f"Name: {request.name}, Age: {request.age}, Income: {request.income}, Risk Tolerance: {request.risk_tolerance}, Investment Goal: {request.investment_goal}, Investment Horizon: {request.investment_horizon}"
         response = await coordinator.process_message(profile_str)
         return FAPAnalyzeResponse(fap_context={}, used_fallback=True, fallback_response=response)
     
     # Build FAP context for normal pipeline
+    user_profile_data = {
+        "name": request.name,
+        "age": request.age,
+        "income": request.income,
+        "risk_tolerance": request.risk_tolerance,
+        "investment_goal": request.investment_goal,
+        "investment_horizon": request.investment_horizon,
+    }
+    session_id = request.session_id or uuid.uuid4().hex
     context = FAPContext(
-        user_profile={
-            "name": request.name,
-            "age": request.age,
-            "income": request.income,
-            "risk_tolerance": request.risk_tolerance,
-            "investment_goal": request.investment_goal,
-            "investment_horizon": request.investment_horizon,
-        },
-        session_id=request.session_id or str(uuid.uuid4()),
+        user_profile=user_profile_data,
+        session_id=session_id,
         history=[]
     )
     
-    # Execute the Financial Analysis Pipeline
-    context = await run_fap_pipeline(context)
+    # Execute the Financial Analysis Pipeline; concurrent requests for the same
+    # profile (and explicit session) share one run and keep their own session id
+    fap_key = profile_cache_key({"session_id": request.session_id, **user_profile_data})
+    context = await single_flight(f"fap:{fap_key}", lambda: run_fap_pipeline(context))
+    fap_context = with_session_id(context.model_dump(), session_id)
     
     # Save FAP results automatically
     try:
-        user_profile_data = {
-            "name": request.name,
-            "age": request.age,
-            "income": request.income,
-            "risk_tolerance": request.risk_tolerance,
-            "investment_goal": request.investment_goal,
-            "investment_horizon": request.investment_horizon
-        }
-        fap_results_service.save_fap_results(context.model_dump(), user_profile_data)
+        await asyncio.to_thread(fap_results_service.save_fap_results, fap_context, user_profile_data)
     except Exception as e:
         logger.warning(f"Failed to save FAP results: {str(e)}")
     
-    return FAPAnalyzeResponse(fap_context=context.model_dump(), used_fallback=False)
+    return FAPAnalyzeResponse(fap_context=fap_context, used_fallback=False)
 
 @app.get("/api/v1/portfolio/holdings")
-async def get_portfolio_holdings():
+def get_portfolio_holdings(request: Request):
     """Get all portfolio holdings"""
     try:
-        return portfolio_service.get_holdings()
+        return etag_json_response(request, portfolio_service.get_holdings())
     except Exception as e:
         logger.error(f"Error getting portfolio holdings: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -453,19 +615,19 @@ async def add_portfolio_holding(holding: PortfolioHolding):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v1/portfolio/transactions")
-async def get_transactions():
+def get_transactions(request: Request):
     """Get all transactions"""
     try:
-        return portfolio_service.get_transactions()
+        return etag_json_response(request, portfolio_service.get_transactions())
     except Exception as e:
         logger.error(f"Error getting transactions: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v1/journal")
-async def get_journal_entries():
+def get_journal_entries(request: Request):
     """Get all journal entries"""
     try:
-        return journal_service.get_entries()
+        return etag_json_response(request, journal_service.get_entries())
     except Exception as e:
         logger.error(f"Error getting journal entries: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -515,12 +677,12 @@ async def get_historical_market_data(symbol: str, period: str = "1d"):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v2/portfolio/analysis")
-async def get_portfolio_analysis():
+def get_portfolio_analysis():
     """Endpoint to analyze portfolio"""
     try:
         profile = user_profile_service.load_profile()
         if not profile:
-            return JSONResponse(status_code=404, content={"error": "No user profile found"})
+            return ORJSONResponse(status_code=404, content={"error": "No user profile found"})
         # Build allocation from saved preferences
         allocation = [
             {
@@ -533,23 +695,17 @@ async def get_portfolio_analysis():
         return {"allocation": allocation, "report": report}
     except Exception as e:
         logger.error(f"Error loading portfolio analysis: {str(e)}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 # Market Analysis Storage Endpoints
 @app.post("/api/v1/market-analysis/save")
-async def save_market_analysis(request: dict):
+async def save_market_analysis(request: MarketAnalysisSaveRequest):
     """Save market analysis to local storage"""
     try:
-        symbol = request.get('symbol')
-        period = request.get('period')
-        analysis = request.get('analysis')
-        market_data = request.get('market_data', {})
-        user_profile = request.get('user_profile', {})
-        
-        if not all([symbol, period, analysis]):
-            raise HTTPException(status_code=400, detail="Missing required fields: symbol, period, analysis")
+        if not all([request.symbol, request.period, request.analysis_data]):
+            raise HTTPException(status_code=400, detail="Missing required fields: symbol, period, analysis_data")
         
-        result = market_analysis_service.save_analysis(symbol, period, analysis, market_data, user_profile)
+        result = market_analysis_service.save_analysis(request.symbol, request.period, request.analysis_data)
         return {"success": True, "analysis": result}
         
     except Exception as e:
@@ -557,12 +713,12 @@ async def save_market_analysis(request: dict):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v1/market/analysis/{symbol}/{period}")
-async def get_market_analysis(symbol: str, period: str):
+def get_market_analysis(request: Request, symbol: str, period: str):
     """Get saved market analysis for specific symbol and period"""
     try:
         analysis = market_analysis_service.load_analysis(symbol, period)
         if analysis:
-            return {"success": True, "analysis": analysis}
+            return etag_json_response(request, {"success": True, "analysis": analysis})
         else:
             return {"success": False, "message": "Analysis not found"}
             
@@ -571,18 +727,18 @@ async def get_market_analysis(symbol: str, period: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v1/market/analysis/recent")
-async def get_recent_market_analyses(limit: int = 10):
+def get_recent_market_analyses(request: Request, limit: int = 10):
     """Get recent market analyses"""
     try:
         analyses = market_analysis_service.get_recent_analyses(limit)
-        return {"success": True, "analyses": analyses}
+        return etag_json_response(request, {"success": True, "analyses": analyses})
         
     except Exception as e:
         logger.error(f"Error getting recent analyses: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v1/market/analysis/summary")
-async def get_market_analysis_summary():
+def get_market_analysis_summary():
     """Get summary of stored market analyses"""
     try:
         summary = market_analysis_service.get_analysis_summary()
@@ -608,12 +764,12 @@ async def delete_market_analysis(symbol: str, period: str):
 
 # FAP Results Storage Endpoints
 @app.get("/api/v1/fap/results")
-async def get_fap_results():
+def get_fap_results(request: Request):
     """Get saved FAP results"""
     try:
         results = fap_results_service.load_fap_results()
         if results:
-            return {"success": True, "results": results}
+            return etag_json_response(request, {"success": True, "results": results})
         else:
             return {"success": False, "message": "No FAP results found"}
             
@@ -622,7 +778,7 @@ async def get_fap_results():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v1/fap/results/summary")
-async def get_fap_results_summary():
+def get_fap_results_summary():
     """Get summary of stored FAP results"""
     try:
         summary = fap_results_service.get_results_summary()
@@ -647,11 +803,10 @@ async def clear_fap_results():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/v1/fap/results/session")
-async def update_fap_session_status(request: dict):
+async def update_fap_session_status(request: FAPSessionStatusRequest):
     """Update FAP session status"""
     try:
-        active = request.get('active', True)
-        success = fap_results_service.update_session_status(active)
+        success = fap_results_service.update_session_status(request.active)
         return {"success": success}
         
     except Exception as e:
@@ -660,12 +815,12 @@ async def update_fap_session_status(request: dict):
 
 # Profile Portfolio Storage Endpoints
 @app.get("/api/v1/profile/portfolio")
-async def get_profile_portfolio():
+def get_profile_portfolio(request: Request):
     """Get saved profile portfolio"""
     try:
         portfolio = profile_portfolio_service.load_profile_portfolio()
         if portfolio:
-            return {"success": True, "portfolio": portfolio}
+            return etag_json_response(request, {"success": True, "portfolio": portfolio})
         else:
             return {"success": False, "message": "No profile portfolio found"}
             
@@ -674,17 +829,13 @@ async def get_profile_portfolio():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/v1/profile/portfolio/save")
-async def save_profile_portfolio(request: dict):
+async def save_profile_portfolio(request: ProfilePortfolioRequest):
     """Save profile portfolio to local storage"""
     try:
-        user_profile = request.get('user_profile')
-        portfolio_allocation = request.get('portfolio_allocation')
-        portfolio_summary = request.get('portfolio_summary')
-        
-        if not all([user_profile, portfolio_allocation, portfolio_summary]):
+        if not all([request.user_profile, request.portfolio_allocation, request.portfolio_summary]):
             raise HTTPException(status_code=400, detail="Missing required fields: user_profile, portfolio_allocation, portfolio_summary")
         
-        result = profile_portfolio_service.save_profile_portfolio(user_profile, portfolio_allocation, portfolio_summary)
+        result = profile_portfolio_service.save_profile_portfolio(request.user_profile, request.portfolio_allocation, request.portfolio_summary)
         return {"success": True, "portfolio": result}
         
     except Exception as e:
@@ -692,17 +843,13 @@ async def save_profile_portfolio(request: dict):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.put("/api/v1/profile/portfolio/update")
-async def update_profile_portfolio(request: dict):
+async def update_profile_portfolio(request: ProfilePortfolioRequest):
     """Update profile portfolio"""
     try:
-        user_profile = request.get('user_profile')
-        portfolio_allocation = request.get('portfolio_allocation')
-        portfolio_summary = request.get('portfolio_summary')
-        
-        if not all([user_profile, portfolio_allocation, portfolio_summary]):
+        if not all([request.user_profile, request.portfolio_allocation, request.portfolio_summary]):
             raise HTTPException(status_code=400, detail="Missing required fields: user_profile, portfolio_allocation, portfolio_summary")
         
-        result = profile_portfolio_service.update_profile_portfolio(user_profile, portfolio_allocation, portfolio_summary)
+        result = profile_portfolio_service.update_profile_portfolio(request.user_profile, request.portfolio_allocation, request.portfolio_summary)
         return {"success": True, "portfolio": result}
         
     except Exception as e:
@@ -724,7 +871,7 @@ async def clear_profile_portfolio():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v1/profile/portfolio/summary")
-async def get_profile_portfolio_summary():
+def get_profile_portfolio_summary():
     """Get summary of stored profile portfolio"""
     try:
         summary = profile_portfolio_service.get_portfolio_summary()
@@ -735,10 +882,15 @@ async def get_profile_portfolio_summary():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v1/profile/portfolio/allocation/{risk_tolerance}")
-async def get_allocation_by_risk_profile(risk_tolerance: str):
+async def get_allocation_by_risk_profile(risk_tolerance: str, response: Response):
     """Get default allocation based on risk profile"""
     try:
+        body = ALLOCATION_RESPONSE_BODIES.get(risk_tolerance)
+        if body is not None:
+            return Response(content=body, media_type="application/json", headers=ALLOCATION_CACHE_HEADERS)
+        
         allocation = profile_portfolio_service.get_allocation_by_risk_profile(risk_tolerance)
+        response.headers.update(ALLOCATION_CACHE_HEADERS)
         return {"success": True, "allocation": allocation, "risk_tolerance": risk_tolerance}
         
     except Exception as e:
@@ -46,9 +46,15 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-here"
     
     # CORS Settings
-    CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
+    CORS_ORIGINS: List[str] = [
+        "http://localhost:3000",
+        "http://127.0.0.1:3000",
+        "http://localhost:5173",
+        "http://127.0.0.1:5173",
+    ]
     CORS_METHODS: List[str] = ["*"]
     CORS_HEADERS: List[str] = ["*"]
+    CORS_MAX_AGE: int = 86400  # Seconds browsers may cache a preflight response
     
     # Cache Settings
     CACHE_TTL: int = 3600
@@ -2,12 +2,15 @@
 FAP Results Service for storing and retrieving Financial Analysis Pipeline results
 """
 
-import json
 import os
 from datetime import datetime
 from typing import Dict, Optional, Any
 import logging
 
+from src.utils.atomic_write import write_json_atomic
+from src.utils.json_cache import JSONFileCache
+from src.utils.timestamps import now_iso
+
 logger = logging.getLogger(__name__)
 
 class FAPResultsService:
@@ -16,12 +19,12 @@ class FAPResultsService:
     def __init__(self, data_dir: str = "data"):
         self.data_dir = data_dir
         self.results_file = os.path.join(data_dir, "fap_results.json")
+        self._results_cache = JSONFileCache()
         self._ensure_data_directory()
     
     def _ensure_data_directory(self):
         """Ensure the data directory exists"""
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
+        os.makedirs(self.data_dir, exist_ok=True)
     
     def save_fap_results(self, fap_context: Dict[str, Any], user_profile: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -38,7 +41,7 @@ class FAPResultsService:
             # Create results entry
             results_entry = {
                 "id": f"fap_{int(datetime.now().timestamp())}",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
                 "fap_context": fap_context,
                 "user_profile": user_profile or {},
                 "session_active": True
@@ -52,8 +55,7 @@ class FAPResultsService:
                 existing_results["session_active"] = False
             
             # Save new results
-            with open(self.results_file, 'w') as f:
-                json.dump(results_entry, f, indent=2)
+            write_json_atomic(self.results_file, results_entry, indent=2)
             
             logger.info("Saved FAP results to local storage")
             return results_entry
@@ -70,11 +72,12 @@ class FAPResultsService:
             FAP results if found, None otherwise
         """
         try:
-            if not os.path.exists(self.results_file):
+            results = self._results_cache.load(self.results_file)
+            if results is None:
                 return None
             
-            with open(self.results_file, 'r') as f:
-                results = json.load(f)
+            # Copy before flagging so the cached parse stays untouched
+            results = dict(results)
                 
             # Mark as loaded (session restored)
             if results:
@@ -105,10 +108,9 @@ class FAPResultsService:
             results = self.load_fap_results()
             if results:
                 results["session_active"] = active
-                results["last_accessed"] = datetime.now().isoformat()
+                results["last_accessed"] = now_iso()
                 
-                with open(self.results_file, 'w') as f:
-                    json.dump(results, f, indent=2)
+                write_json_atomic(self.results_file, results, indent=2)
                 
                 return True
             return False
@@ -4,6 +4,7 @@ import os
 from datetime import datetime
 
 from src.models.journal import JournalEntry
+from src.utils.atomic_write import write_json_atomic
 
 JOURNAL_FILE = "data/journal.json"
 
@@ -12,8 +13,7 @@ class JournalService:
         self._ensure_data_file_exists()
 
     def _ensure_data_file_exists(self):
-        if not os.path.exists("data"):
-            os.makedirs("data")
+        os.makedirs("data", exist_ok=True)
         if not os.path.exists(JOURNAL_FILE):
             with open(JOURNAL_FILE, "w") as f:
                 json.dump({"entries": []}, f, indent=2)
@@ -23,8 +23,7 @@ class JournalService:
             return json.load(f)
 
     def _write_data(self, data: Dict):
-        with open(JOURNAL_FILE, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        write_json_atomic(JOURNAL_FILE, data, indent=2, default=str)
 
     def get_entries(self) -> List[JournalEntry]:
         data = self._read_data()
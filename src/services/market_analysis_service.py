@@ -2,12 +2,16 @@
 Market Analysis Service for storing and retrieving analysis results
 """
 
-import json
+import heapq
 import os
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 import logging
 
+from src.utils.atomic_write import write_json_atomic
+from src.utils.json_cache import JSONFileCache
+from src.utils.timestamps import now_iso
+
 logger = logging.getLogger(__name__)
 
 class MarketAnalysisService:
@@ -16,12 +20,12 @@ class MarketAnalysisService:
     def __init__(self, data_dir: str = "data"):
         self.data_dir = data_dir
         self.analysis_file = os.path.join(data_dir, "market_analysis.json")
+        self._analyses_cache = JSONFileCache()
         self._ensure_data_directory()
     
     def _ensure_data_directory(self):
         """Ensure the data directory exists"""
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
+        os.makedirs(self.data_dir, exist_ok=True)
     
     def save_analysis(self, symbol: str, period: str, analysis_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -36,15 +40,16 @@ class MarketAnalysisService:
             Saved analysis entry with metadata
         """
         try:
-            # Load existing analyses
-            analyses = self.load_all_analyses()
+            # Load existing analyses; an unreadable file raises rather than
+            # being overwritten with just this entry
+            analyses = self._read_analyses()
             
             # Create analysis entry
             analysis_entry = {
                 "id": f"{symbol}_{period}_{int(datetime.now().timestamp())}",
                 "symbol": symbol,
                 "period": period,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
                 "analysis_data": analysis_data
             }
             
@@ -53,8 +58,7 @@ class MarketAnalysisService:
             analyses[analysis_key] = analysis_entry
             
             # Save to file
-            with open(self.analysis_file, 'w') as f:
-                json.dump(analyses, f, indent=2)
+            write_json_atomic(self.analysis_file, analyses, indent=2)
             
             logger.info(f"Saved market analysis for {symbol} ({period})")
             return analysis_entry
@@ -83,14 +87,16 @@ class MarketAnalysisService:
             logger.error(f"Error loading market analysis for {symbol} ({period}): {str(e)}")
             return None
     
+    def _read_analyses(self) -> Dict[str, Any]:
+        """Read all analyses, raising if the file exists but cannot be parsed"""
+        analyses = self._analyses_cache.load(self.analysis_file)
+        # Callers add and remove keys, so hand out a copy of the cached parse
+        return dict(analyses) if analyses is not None else {}
+    
     def load_all_analyses(self) -> Dict[str, Any]:
         """Load all market analyses from file"""
         try:
-            if not os.path.exists(self.analysis_file):
-                return {}
-            
-            with open(self.analysis_file, 'r') as f:
-                return json.load(f)
+            return self._read_analyses()
                 
         except Exception as e:
             logger.error(f"Error loading market analyses: {str(e)}")
@@ -109,11 +115,8 @@ class MarketAnalysisService:
         try:
             analyses = self.load_all_analyses()
             
-            # Convert to list and sort by timestamp
-            analysis_list = list(analyses.values())
-            analysis_list.sort(key=lambda x: x['timestamp'], reverse=True)
-            
-            return analysis_list[:limit]
+            # Select the newest entries without sorting the whole collection
+            return heapq.nlargest(limit, analyses.values(), key=lambda x: x['timestamp'])
             
         except Exception as e:
             logger.error(f"Error getting recent analyses: {str(e)}")
@@ -131,14 +134,13 @@ class MarketAnalysisService:
             True if deleted successfully, False otherwise
         """
         try:
-            analyses = self.load_all_analyses()
+            analyses = self._read_analyses()
             analysis_key = f"{symbol}_{period}"
             
             if analysis_key in analyses:
                 del analyses[analysis_key]
                 
-                with open(self.analysis_file, 'w') as f:
-                    json.dump(analyses, f, indent=2)
+                write_json_atomic(self.analysis_file, analyses, indent=2)
                 
                 logger.info(f"Deleted market analysis for {symbol} ({period})")
                 return True
@@ -152,8 +154,7 @@ class MarketAnalysisService:
     def clear_all_analyses(self) -> bool:
         """Clear all stored analyses"""
         try:
-            with open(self.analysis_file, 'w') as f:
-                json.dump({}, f)
+            write_json_atomic(self.analysis_file, {})
             
             logger.info("Cleared all market analyses")
             return True
@@ -14,6 +14,24 @@ from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Display name -> ticker for the indices shown on the markets tab
+MAJOR_INDICES = {
+    "Dow": "^DJI",
+    "S&P 500": "^GSPC",
+    "Nasdaq": "^IXIC",
+    "VIX": "^VIX",
+    "Gold": "GC=F",
+    "Oil": "CL=F",
+}
+INDEX_NAMES_BY_SYMBOL = {symbol: name for name, symbol in MAJOR_INDICES.items()}
+
+# Bar interval to request for each history period; anything else is intraday
+_HISTORY_INTERVALS = {
+    "1y": "1d", "2y": "1d", "5y": "1d", "max": "1d",
+    "1mo": "1d", "3mo": "1d", "6mo": "1d",
+    "5d": "15m",
+}
+
 class MarketDataService:
     """Service for fetching and processing market data from multiple sources"""
     
@@ -26,21 +44,24 @@ class MarketDataService:
     async def get_stock_data(self, symbol: str, period: str = "1d") -> Dict:
         """Get stock data from Yahoo Finance"""
         try:
+            # yfinance is blocking; run it in a thread so gathered calls overlap
             stock = yf.Ticker(symbol)
-            hist = stock.history(period=period)
+            hist = await asyncio.to_thread(stock.history, period=period)
             
             if hist.empty:
                 return {"error": f"No data found for {symbol}"}
             
-            # Get the latest data
+            # Get the latest data, as plain Python numbers rather than numpy scalars
             latest = hist.iloc[-1]
+            close = float(latest["Close"])
+            open_price = float(latest["Open"])
             
             return {
                 "symbol": symbol,
-                "price": latest["Close"],
-                "change": latest["Close"] - latest["Open"],
-                "change_percent": ((latest["Close"] - latest["Open"]) / latest["Open"]) * 100,
-                "volume": latest["Volume"],
+                "price": close,
+                "change": close - open_price,
+                "change_percent": ((close - open_price) / open_price) * 100,
+                "volume": int(latest["Volume"]),
                 "timestamp": datetime.now().isoformat()
             }
         except Exception as e:
@@ -144,9 +165,11 @@ class MarketDataService:
     async def get_market_summary(self) -> Dict:
         """Get a summary of market conditions"""
         try:
-            # Get data from both sources
-            alpha_data = await self.get_market_data()
-            spy_data = await self.get_stock_data("SPY")
+            # Get data from both sources concurrently
+            alpha_data, spy_data = await asyncio.gather(
+                self.get_market_data(),
+                self.get_stock_data("SPY")
+            )
             
             # Combine and analyze data
             summary = {
@@ -193,23 +216,14 @@ class MarketDataService:
 
     async def get_major_indices(self) -> List[Dict]:
         """Get data for major market indices, VIX, Gold, and Oil."""
-        symbols = {
-            "Dow": "^DJI",
-            "S&P 500": "^GSPC",
-            "Nasdaq": "^IXIC",
-            "VIX": "^VIX",
-            "Gold": "GC=F",
-            "Oil": "CL=F",
-        }
-        
-        tasks = [self.get_stock_data(symbol) for symbol in symbols.values()]
+        tasks = [self.get_stock_data(symbol) for symbol in MAJOR_INDICES.values()]
         results = await asyncio.gather(*tasks)
         
         # Map results back to names
         named_results = []
         for result in results:
             if "error" not in result:
-                name = next((name for name, sym in symbols.items() if sym == result["symbol"]), None)
+                name = INDEX_NAMES_BY_SYMBOL.get(result["symbol"])
                 if name:
                     result["name"] = name
                     named_results.append(result)
@@ -221,17 +235,9 @@ class MarketDataService:
         try:
             stock = yf.Ticker(symbol)
             # Adjust interval for longer periods
-            if period in ["1y", "2y", "5y", "max"]:
-                interval = "1d"
-            elif period in ["1mo", "3mo", "6mo"]:
-                 interval = "1d"
-            elif period == "5d":
-                interval = "15m"
-            else: #1d
-                interval = "5m"
-
+            interval = _HISTORY_INTERVALS.get(period, "5m")
 
-            hist = stock.history(period=period, interval=interval)
+            hist = await asyncio.to_thread(stock.history, period=period, interval=interval)
             
             if hist.empty:
                 return {"error": f"No historical data found for {symbol}"}
@@ -243,7 +249,7 @@ class MarketDataService:
             return {
                 "symbol": symbol,
                 "history": [
-                    {"date": row[date_column].isoformat(), "price": row["Close"]}
+                    {"date": row[date_column].isoformat(), "price": float(row["Close"])}
                     for index, row in hist.iterrows()
                 ]
             }
@@ -5,6 +5,7 @@ import os
 import uuid
 
 from src.models.portfolio import PortfolioHolding, Transaction
+from src.utils.atomic_write import write_json_atomic
 
 PORTFOLIO_FILE = "data/portfolio_holdings.json"
 TRANSACTIONS_FILE = "data/transactions.json"
@@ -14,8 +15,7 @@ class PortfolioService:
         self._ensure_data_files_exist()
 
     def _ensure_data_files_exist(self):
-        if not os.path.exists("data"):
-            os.makedirs("data")
+        os.makedirs("data", exist_ok=True)
         if not os.path.exists(PORTFOLIO_FILE):
             with open(PORTFOLIO_FILE, "w") as f:
                 json.dump({"holdings": [], "last_updated": str(datetime.now())}, f, indent=2)
@@ -28,8 +28,7 @@ class PortfolioService:
             return json.load(f)
 
     def _write_data(self, file_path: str, data: Dict):
-        with open(file_path, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        write_json_atomic(file_path, data, indent=2, default=str)
 
     def get_holdings(self) -> List[PortfolioHolding]:
         data = self._read_data(PORTFOLIO_FILE)
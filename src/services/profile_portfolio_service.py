@@ -2,26 +2,63 @@
 Profile Portfolio Service for storing and retrieving profile-based portfolio allocations
 """
 
-import json
 import os
 from datetime import datetime
 from typing import Dict, Optional, Any, List
 import logging
 
+from src.utils.atomic_write import write_json_atomic
+from src.utils.json_cache import JSONFileCache
+from src.utils.timestamps import now_iso
+
 logger = logging.getLogger(__name__)
 
+# Default allocations based on risk profile
+DEFAULT_ALLOCATIONS = {
+    "conservative": [
+        {"asset_type": "bonds", "allocation_percentage": 45},
+        {"asset_type": "stocks", "allocation_percentage": 25},
+        {"asset_type": "cash", "allocation_percentage": 15},
+        {"asset_type": "real_estate", "allocation_percentage": 10},
+        {"asset_type": "etfs", "allocation_percentage": 5},
+        {"asset_type": "reits", "allocation_percentage": 0},
+        {"asset_type": "commodities", "allocation_percentage": 0},
+        {"asset_type": "cryptocurrency", "allocation_percentage": 0}
+    ],
+    "moderate": [
+        {"asset_type": "stocks", "allocation_percentage": 50},
+        {"asset_type": "bonds", "allocation_percentage": 25},
+        {"asset_type": "etfs", "allocation_percentage": 10},
+        {"asset_type": "real_estate", "allocation_percentage": 8},
+        {"asset_type": "cash", "allocation_percentage": 5},
+        {"asset_type": "reits", "allocation_percentage": 2},
+        {"asset_type": "commodities", "allocation_percentage": 0},
+        {"asset_type": "cryptocurrency", "allocation_percentage": 0}
+    ],
+    "aggressive": [
+        {"asset_type": "stocks", "allocation_percentage": 65},
+        {"asset_type": "bonds", "allocation_percentage": 15},
+        {"asset_type": "etfs", "allocation_percentage": 10},
+        {"asset_type": "real_estate", "allocation_percentage": 5},
+        {"asset_type": "cryptocurrency", "allocation_percentage": 3},
+        {"asset_type": "commodities", "allocation_percentage": 2},
+        {"asset_type": "reits", "allocation_percentage": 0},
+        {"asset_type": "cash", "allocation_percentage": 0}
+    ]
+}
+
 class ProfilePortfolioService:
     """Service for managing profile-based portfolio storage and retrieval"""
     
     def __init__(self, data_dir: str = "data"):
         self.data_dir = data_dir
         self.portfolio_file = os.path.join(data_dir, "profile_portfolio.json")
+        self._portfolio_cache = JSONFileCache()
         self._ensure_data_directory()
     
     def _ensure_data_directory(self):
         """Ensure the data directory exists"""
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
+        os.makedirs(self.data_dir, exist_ok=True)
     
     def save_profile_portfolio(self, 
                               user_profile: Dict[str, Any], 
@@ -42,19 +79,18 @@ class ProfilePortfolioService:
             # Create portfolio entry
             portfolio_entry = {
                 "id": f"profile_portfolio_{int(datetime.now().timestamp())}",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
                 "user_profile": user_profile,
                 "portfolio_allocation": portfolio_allocation,
                 "portfolio_summary": portfolio_summary,
                 "risk_profile": user_profile.get("risk_tolerance", "moderate"),
                 "total_allocation": sum(item.get("allocation_percentage", 0) for item in portfolio_allocation),
                 "asset_classes": len(portfolio_allocation),
-                "last_updated": datetime.now().isoformat()
+                "last_updated": now_iso()
             }
             
             # Save to file
-            with open(self.portfolio_file, 'w') as f:
-                json.dump(portfolio_entry, f, indent=2)
+            write_json_atomic(self.portfolio_file, portfolio_entry, indent=2)
             
             logger.info("Saved profile portfolio to local storage")
             return portfolio_entry
@@ -71,11 +107,12 @@ class ProfilePortfolioService:
             Profile portfolio if found, None otherwise
         """
         try:
-            if not os.path.exists(self.portfolio_file):
+            portfolio = self._portfolio_cache.load(self.portfolio_file)
+            if portfolio is None:
                 return None
             
-            with open(self.portfolio_file, 'r') as f:
-                portfolio = json.load(f)
+            # Copy before flagging so the cached parse stays untouched
+            portfolio = dict(portfolio)
                 
             # Add loaded flag
             if portfolio:
@@ -109,20 +146,19 @@ class ProfilePortfolioService:
             # Create updated entry
             updated_entry = {
                 "id": existing_portfolio.get("id", f"profile_portfolio_{int(datetime.now().timestamp())}") if existing_portfolio else f"profile_portfolio_{int(datetime.now().timestamp())}",
-                "timestamp": existing_portfolio.get("timestamp", datetime.now().isoformat()) if existing_portfolio else datetime.now().isoformat(),
+                "timestamp": existing_portfolio.get("timestamp", now_iso()) if existing_portfolio else now_iso(),
                 "user_profile": user_profile,
                 "portfolio_allocation": portfolio_allocation,
                 "portfolio_summary": portfolio_summary,
                 "risk_profile": user_profile.get("risk_tolerance", "moderate"),
                 "total_allocation": sum(item.get("allocation_percentage", 0) for item in portfolio_allocation),
                 "asset_classes": len(portfolio_allocation),
-                "last_updated": datetime.now().isoformat(),
+                "last_updated": now_iso(),
                 "update_count": existing_portfolio.get("update_count", 0) + 1 if existing_portfolio else 1
             }
             
             # Save updated entry
-            with open(self.portfolio_file, 'w') as f:
-                json.dump(updated_entry, f, indent=2)
+            write_json_atomic(self.portfolio_file, updated_entry, indent=2)
             
             logger.info("Updated profile portfolio in local storage")
             return updated_entry
@@ -185,41 +221,8 @@ class ProfilePortfolioService:
             Default allocation for the risk profile
         """
         try:
-            # Default allocations based on risk profile
-            allocations = {
-                "conservative": [
-                    {"asset_type": "bonds", "allocation_percentage": 45},
-                    {"asset_type": "stocks", "allocation_percentage": 25},
-                    {"asset_type": "cash", "allocation_percentage": 15},
-                    {"asset_type": "real_estate", "allocation_percentage": 10},
-                    {"asset_type": "etfs", "allocation_percentage": 5},
-                    {"asset_type": "reits", "allocation_percentage": 0},
-                    {"asset_type": "commodities", "allocation_percentage": 0},
-                    {"asset_type": "cryptocurrency", "allocation_percentage": 0}
-                ],
-                "moderate": [
-                    {"asset_type": "stocks", "allocation_percentage": 50},
-                    {"asset_type": "bonds", "allocation_percentage": 25},
-                    {"asset_type": "etfs", "allocation_percentage": 10},
-                    {"asset_type": "real_estate", "allocation_percentage": 8},
-                    {"asset_type": "cash", "allocation_percentage": 5},
-                    {"asset_type": "reits", "allocation_percentage": 2},
-                    {"asset_type": "commodities", "allocation_percentage": 0},
-                    {"asset_type": "cryptocurrency", "allocation_percentage": 0}
-                ],
-                "aggressive": [
-                    {"asset_type": "stocks", "allocation_percentage": 65},
-                    {"asset_type": "bonds", "allocation_percentage": 15},
-                    {"asset_type": "etfs", "allocation_percentage": 10},
-                    {"asset_type": "real_estate", "allocation_percentage": 5},
-                    {"asset_type": "cryptocurrency", "allocation_percentage": 3},
-                    {"asset_type": "commodities", "allocation_percentage": 2},
-                    {"asset_type": "reits", "allocation_percentage": 0},
-                    {"asset_type": "cash", "allocation_percentage": 0}
-                ]
-            }
-            
-            return allocations.get(risk_tolerance.lower(), allocations["moderate"])
+            allocation = DEFAULT_ALLOCATIONS.get(risk_tolerance.lower(), DEFAULT_ALLOCATIONS["moderate"])
+            return [dict(item) for item in allocation]
             
         except Exception as e:
             logger.error(f"Error getting allocation by risk profile: {str(e)}")
@@ -9,9 +9,22 @@ import logging
 from pathlib import Path
 
 from src.models.user_profile import UserProfile, InvestmentPreference
+from src.utils.atomic_write import write_json_atomic
 
 logger = logging.getLogger(__name__)
 
+# Balanced allocation every new profile starts with
+DEFAULT_PREFERENCES = (
+    InvestmentPreference(asset_type="stocks", allocation_percentage=50, risk_tolerance="moderate"),
+    InvestmentPreference(asset_type="bonds", allocation_percentage=20, risk_tolerance="conservative"),
+    InvestmentPreference(asset_type="cash", allocation_percentage=5, risk_tolerance="conservative"),
+    InvestmentPreference(asset_type="real estate", allocation_percentage=10, risk_tolerance="moderate"),
+    InvestmentPreference(asset_type="commodities", allocation_percentage=5, risk_tolerance="moderate"),
+    InvestmentPreference(asset_type="cryptocurrency", allocation_percentage=3, risk_tolerance="aggressive"),
+    InvestmentPreference(asset_type="etfs", allocation_percentage=5, risk_tolerance="moderate"),
+    InvestmentPreference(asset_type="reits", allocation_percentage=2, risk_tolerance="moderate")
+)
+
 class UserProfileService:
     """Service for managing user profiles"""
     
@@ -32,8 +45,7 @@ class UserProfileService:
             
             # Convert to dict and save
             profile_dict = profile.model_dump()
-            with open(self.profile_file, 'w') as f:
-                json.dump(profile_dict, f, indent=2, default=str)
+            write_json_atomic(self.profile_file, profile_dict, indent=2, default=str)
             
             return True
         except Exception as e:
@@ -105,16 +117,8 @@ class UserProfileService:
     
     def create_default_profile(self, user_id: str, name: str, age: int, income: float) -> UserProfile:
         """Create a default user profile with balanced allocation"""
-        default_preferences = [
-            InvestmentPreference(asset_type="stocks", allocation_percentage=50, risk_tolerance="moderate"),
-            InvestmentPreference(asset_type="bonds", allocation_percentage=20, risk_tolerance="conservative"),
-            InvestmentPreference(asset_type="cash", allocation_percentage=5, risk_tolerance="conservative"),
-            InvestmentPreference(asset_type="real estate", allocation_percentage=10, risk_tolerance="moderate"),
-            InvestmentPreference(asset_type="commodities", allocation_percentage=5, risk_tolerance="moderate"),
-            InvestmentPreference(asset_type="cryptocurrency", allocation_percentage=3, risk_tolerance="aggressive"),
-            InvestmentPreference(asset_type="etfs", allocation_percentage=5, risk_tolerance="moderate"),
-            InvestmentPreference(asset_type="reits", allocation_percentage=2, risk_tolerance="moderate")
-        ]
+        # Copy the shared defaults so edits to this profile cannot leak into them
+        default_preferences = [preference.model_copy() for preference in DEFAULT_PREFERENCES]
         profile = UserProfile(
             user_id=user_id,
             name=name,
@@ -0,0 +1,26 @@
+"""
+Atomic replacement of the JSON files the services persist to
+"""
+
+import json
+import os
+import tempfile
+from typing import Any
+
+def write_json_atomic(path: str, data: Any, **dump_options) -> None:
+    """
+    Write data as JSON to path without ever exposing a partial file
+
+    The JSON is written to a temporary file in the same directory and then
+    moved over path with os.replace, so a concurrent reader sees either the
+    old contents or the new ones. dump_options are passed to json.dump.
+    """
+    directory = os.path.dirname(os.fspath(path)) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, **dump_options)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,36 @@
+"""
+Parse cache for the JSON files the services read on every request
+"""
+
+import json
+import os
+from typing import Any, Optional
+
+class JSONFileCache:
+    """Keep the parsed contents of one JSON file until the file changes on disk"""
+    
+    def __init__(self):
+        self._stamp = None
+        self._data = None
+    
+    def load(self, path: str) -> Optional[Any]:
+        """
+        Return the parsed contents of path, or None if the file does not exist
+        
+        The file is only re-read when its path, size or modification time
+        changes. The cached object is shared, so callers must copy it before
+        mutating it.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self._stamp = self._data = None
+            return None
+        
+        stamp = (path, stat.st_mtime_ns, stat.st_size)
+        if stamp != self._stamp:
+            # Parsed with the stdlib so NaN/Infinity written by json.dump load back
+            with open(path, 'r') as f:
+                self._data = json.load(f)
+            self._stamp = stamp
+        return self._data
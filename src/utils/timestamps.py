@@ -0,0 +1,19 @@
+"""
+Timestamp helpers shared by the JSON-backed services
+"""
+
+import time
+from datetime import datetime
+
+# (epoch second, ISO string) for the most recently formatted second
+_cached_timestamp = (0, "")
+
+def now_iso() -> str:
+    """Return the current local time as an ISO-8601 string at one-second resolution"""
+    global _cached_timestamp
+    second = int(time.time())
+    cached_second, cached_iso = _cached_timestamp
+    if second != cached_second:
+        cached_iso = datetime.fromtimestamp(second).isoformat()
+        _cached_timestamp = (second, cached_iso)
+    return cached_iso
@@ -0,0 +1,39 @@
+"""
+In-process cache for expensive agent results
+"""
+
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+class TTLCache:
+    """Map keys to values that expire a fixed number of seconds after being set"""
+
+    def __init__(self, ttl: float, maxsize: int = 512):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.ttl:
+            del self._entries[key]
+            return None
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, dropping expired entries and then the oldest if full"""
+        now = time.monotonic()
+        if len(self._entries) >= self.maxsize:
+            for stale in [k for k, (ts, _) in self._entries.items() if now - ts >= self.ttl]:
+                del self._entries[stale]
+            while len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+        self._entries.pop(key, None)
+        self._entries[key] = (now, value)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self._entries.clear()
@@ -83,13 +83,17 @@ install_dependencies() {
     echo -e "${BLUE}Activating virtual environment...${NC}"
     source venv/bin/activate
 
+    # Backend and frontend installs are independent, so run them side by side
     echo -e "${BLUE}Installing backend dependencies...${NC}"
-    pip install -r requirements.txt
+    pip install --disable-pip-version-check --prefer-binary -r requirements.txt &
+    pip_pid=$!
 
     echo -e "${BLUE}Installing frontend dependencies...${NC}"
-    cd frontend
-    npm install
-    cd ..
+    (cd frontend && npm install) &
+    npm_pid=$!
+
+    wait $pip_pid
+    wait $npm_pid
 }
 
 # Function to start servers
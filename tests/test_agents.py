@@ -46,6 +46,23 @@ async def test_risk_assessment_agent():
     assert assessment.profile_analysis["age"] == "35 years"
     assert assessment.profile_analysis["income"] == "$150,000"
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("text, income", [
+    ("I earn $150,000 a year", 150000),
+    ("I earn $ 85000, mostly salary", 85000),
+    ("I earn $85.5k a year", 100000),
+    ("I earn $1.5M a year", 100000),
+    ("I earn $200k a year", 100000),
+    ("I earn $2 M a year", 100000),
+])
+async def test_risk_assessment_income_parsing(text, income):
+    """Test that only plain dollar amounts are read as income"""
+    agent = RiskAssessmentAgent()
+    
+    with patch('src.services.user_profile_service.UserProfileService.load_profile', return_value=None):
+        profile = await agent._parse_profile(text)
+    assert profile.income == income
+
 @pytest.mark.asyncio
 async def test_portfolio_agent():
     """Test the portfolio agent"""
@@ -5,9 +5,10 @@ Tests for the API endpoints
 import pytest
 from fastapi.testclient import TestClient
 from pathlib import Path
+from unittest.mock import AsyncMock, patch
 import shutil
 
-from src.api.main import app
+from src.api.main import app, coordinator, proposal_cache
 from src.services.user_profile_service import UserProfileService
 
 @pytest.fixture
@@ -33,6 +34,24 @@ def test_health_check(client):
     assert response.status_code == 200
     assert response.json() == {"status": "healthy"}
 
+def test_health_check_cors(client):
+    """Test that cross-origin health checks get CORS headers"""
+    origin = "http://localhost:3000"
+    response = client.get("/api/v1/health", headers={"Origin": origin})
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == origin
+
+def test_journal_not_modified(client):
+    """Test that a matching If-None-Match header returns 304"""
+    response = client.get("/api/v1/journal")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    
+    response = client.get("/api/v1/journal", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
 def test_create_profile(client, user_profile_service):
     """Test creating a user profile"""
     profile_data = {
@@ -93,6 +112,43 @@ def test_chat_endpoint(client):
     assert response.status_code == 200
     assert "response" in response.json()
 
+def test_chat_stream_endpoint(client):
+    """Test that the chat stream sends each token and then a done event"""
+    async def fake_stream(message, user_id=None):
+        for token in ("Buy", " index", " funds"):
+            yield token
+    
+    with patch.object(coordinator, "stream_message", fake_stream):
+        response = client.post(
+            "/api/v1/chat/stream",
+            json={"message": "Advice?"},
+            headers={"Accept-Encoding": "gzip"}
+        )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert "content-encoding" not in response.headers
+    assert response.text.split("\n\n")[:-1] == [
+        'data: {"token":"Buy"}',
+        'data: {"token":" index"}',
+        'data: {"token":" funds"}',
+        "event: done\ndata: {}",
+    ]
+
+def test_chat_stream_endpoint_error(client):
+    """Test that a failing stream sends an error event before the done event"""
+    async def failing_stream(message, user_id=None):
+        yield "Buy"
+        raise RuntimeError("model unavailable")
+    
+    with patch.object(coordinator, "stream_message", failing_stream):
+        response = client.post("/api/v1/chat/stream", json={"message": "Advice?"})
+    assert response.status_code == 200
+    assert response.text.split("\n\n")[:-1] == [
+        'data: {"token":"Buy"}',
+        'event: error\ndata: {"error":"model unavailable"}',
+        "event: done\ndata: {}",
+    ]
+
 def test_chat_endpoint_with_user_id(client, user_profile_service):
     """Test the chat endpoint with a user ID"""
     # Create a profile first
@@ -112,4 +168,45 @@ def test_chat_endpoint_with_user_id(client, user_profile_service):
     message = "What's a good investment strategy for retirement?"
     response = client.post("/api/v1/chat", json={"message": message, "user_id": user_id})
     assert response.status_code == 200
-    assert "response" in response.json() 
\ No newline at end of file
+    assert "response" in response.json() 
+
+PROPOSAL = """---
+Portfolio Allocation:
+- Stocks: 60%
+- Bonds: 30%
+- Cash: 10%
+---
+Report:
+Summary:
+Balanced growth.
+---"""
+
+def _update_profile_twice(client, proposal):
+    """Create a profile, then update it twice with a stubbed coordinator"""
+    proposal_cache.clear()
+    profile_data = {
+        "name": "Cache User",
+        "age": 41,
+        "income": 90000,
+        "risk_tolerance": "moderate",
+        "investment_goal": "balanced_growth",
+        "investment_horizon": "long-term"
+    }
+    user_id = client.post("/api/v1/profile", json=profile_data).json()["user_id"]
+    
+    with patch.object(coordinator, "process_message", AsyncMock(return_value=proposal)) as mock:
+        responses = [client.put(f"/api/v1/profile/{user_id}", json=profile_data) for _ in range(2)]
+    return mock, responses
+
+def test_update_profile_reuses_proposal(client):
+    """Test that an unchanged profile reuses the cached proposal"""
+    mock, responses = _update_profile_twice(client, PROPOSAL)
+    assert mock.await_count == 1
+    assert [r.json()["proposal"] for r in responses] == [PROPOSAL, PROPOSAL]
+
+def test_update_profile_does_not_reuse_failed_proposal(client):
+    """Test that a proposal without an allocation is not cached"""
+    error = "I apologize, but I encountered an error: timeout"
+    mock, responses = _update_profile_twice(client, error)
+    assert mock.await_count == 2
+    assert all(r.status_code == 200 for r in responses)
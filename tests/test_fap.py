@@ -2,9 +2,13 @@
 Financial Analysis Pipeline (FAP) Tests
 Tests for the FAP system endpoints and functionality
 """
+import asyncio
+import copy
 import pytest
+import httpx
+from unittest.mock import patch
 from fastapi.testclient import TestClient
-from src.api.main import app
+from src.api.main import app, fap_results_service
 
 client = TestClient(app)
 
@@ -50,4 +54,45 @@ def test_fap_analyze_invalid():
         "name": "Test User"
     }
     resp = client.post("/api/v1/fap/analyze", json=payload)
-    assert resp.status_code == 422  # Unprocessable Entity 
\ No newline at end of file
+    assert resp.status_code == 422  # Unprocessable Entity 
+
+@pytest.mark.asyncio
+async def test_fap_analyze_concurrent_requests_share_one_run():
+    """Test that concurrent identical requests share a pipeline run but keep their own session ids"""
+    runs = []
+    
+    async def fake_pipeline(context):
+        runs.append(context.session_id)
+        await asyncio.sleep(0.05)
+        context.risk_assessment = {"raw": "Moderate"}
+        context.history.append(copy.deepcopy(context.model_dump()))
+        context.report = "Balanced growth."
+        context.history.append(copy.deepcopy(context.model_dump()))
+        return context
+    
+    payload = {
+        "name": "Concurrent User",
+        "age": 35,
+        "income": 100000,
+        "risk_tolerance": "moderate",
+        "investment_goal": "balanced_growth",
+        "investment_horizon": "medium-term"
+    }
+    transport = httpx.ASGITransport(app=app)
+    with patch("src.api.main.run_fap_pipeline", fake_pipeline), \
+            patch.object(fap_results_service, "save_fap_results"):
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            responses = await asyncio.gather(*[
+                async_client.post("/api/v1/fap/analyze", json=payload) for _ in range(2)
+            ])
+    
+    assert len(runs) == 1
+    session_ids = set()
+    for resp in responses:
+        assert resp.status_code == 200
+        fap_context = resp.json()["fap_context"]
+        session_id = fap_context["session_id"]
+        session_ids.add(session_id)
+        assert [snapshot["session_id"] for snapshot in fap_context["history"]] == [session_id, session_id]
+        assert fap_context["history"][1]["history"][0]["session_id"] == session_id
+    assert len(session_ids) == 2
@@ -0,0 +1,34 @@
+"""
+Tests for the market analysis storage service
+"""
+
+import math
+
+import pytest
+
+from src.services.market_analysis_service import MarketAnalysisService
+
+@pytest.fixture
+def service(tmp_path):
+    """Create a MarketAnalysisService backed by a temporary directory"""
+    return MarketAnalysisService(data_dir=str(tmp_path))
+
+def test_analyses_with_nan_survive_later_saves(service):
+    """Test that NaN values written by json.dump load back and are kept"""
+    service.save_analysis("^GSPC", "1mo", {"volatility": float("nan")})
+    service.save_analysis("GC=F", "6mo", {"volatility": 12.5})
+
+    analyses = service.load_all_analyses()
+    assert set(analyses) == {"^GSPC_1mo", "GC=F_6mo"}
+    assert math.isnan(analyses["^GSPC_1mo"]["analysis_data"]["volatility"])
+
+def test_unreadable_file_is_not_overwritten(service):
+    """Test that a save fails instead of replacing a file it cannot parse"""
+    with open(service.analysis_file, "w") as f:
+        f.write('{"^GSPC_1mo": {')
+
+    with pytest.raises(ValueError):
+        service.save_analysis("GC=F", "6mo", {"volatility": 12.5})
+    assert service.delete_analysis("^GSPC", "1mo") is False
+    with open(service.analysis_file) as f:
+        assert f.read() == '{"^GSPC_1mo": {'
@@ -0,0 +1,58 @@
+"""
+Tests for the shared utilities
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.atomic_write import write_json_atomic
+from src.utils.ttl_cache import TTLCache
+
+def test_ttl_cache_expires_entries():
+    """Test that entries are returned until their TTL has passed"""
+    cache = TTLCache(ttl=10)
+    with patch("src.utils.ttl_cache.time.monotonic", return_value=100.0):
+        cache.set("report", {"allocation": []})
+
+    with patch("src.utils.ttl_cache.time.monotonic", return_value=109.9):
+        assert cache.get("report") == {"allocation": []}
+    with patch("src.utils.ttl_cache.time.monotonic", return_value=110.0):
+        assert cache.get("report") is None
+    assert cache.get("missing") is None
+
+def test_ttl_cache_evicts_when_full():
+    """Test that a full cache drops expired entries first, then the oldest"""
+    cache = TTLCache(ttl=10, maxsize=2)
+    with patch("src.utils.ttl_cache.time.monotonic", return_value=0.0):
+        cache.set("a", 1)
+    with patch("src.utils.ttl_cache.time.monotonic", return_value=8.0):
+        cache.set("b", 2)
+
+    with patch("src.utils.ttl_cache.time.monotonic", return_value=12.0):
+        # "a" has expired, so "b" survives
+        cache.set("c", 3)
+        assert (cache.get("b"), cache.get("c")) == (2, 3)
+        # Nothing has expired, so the oldest entry goes
+        cache.set("d", 4)
+        assert (cache.get("b"), cache.get("c"), cache.get("d")) == (None, 3, 4)
+
+def test_write_json_atomic_replaces_file(tmp_path):
+    """Test that the target is replaced and no temporary file is left behind"""
+    target = tmp_path / "profile.json"
+    target.write_text('{"name": "old"}')
+    
+    write_json_atomic(target, {"name": "new"}, indent=2)
+    assert json.loads(target.read_text()) == {"name": "new"}
+    assert [p.name for p in tmp_path.iterdir()] == ["profile.json"]
+
+def test_write_json_atomic_keeps_original_on_failure(tmp_path):
+    """Test that a failed write leaves the previous contents intact"""
+    target = tmp_path / "profile.json"
+    target.write_text('{"name": "old"}')
+    
+    with pytest.raises(TypeError):
+        write_json_atomic(target, {"name": object()})
+    assert json.loads(target.read_text()) == {"name": "old"}
+    assert [p.name for p in tmp_path.iterdir()] == ["profile.json"]